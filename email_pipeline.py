@@ -0,0 +1,37 @@
+import json
+from email_spider import domain
+
+
+class UpdateCompaniesPipeline:
+    """Collects scraped emails per origin domain and writes them back into
+    the companies JSON file (COMPANIES_FILE setting) when the spider closes."""
+
+    def __init__(self, companies_file):
+        self.companies_file = companies_file
+        self.domain_to_emails = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings.get('COMPANIES_FILE'))
+
+    def process_item(self, item, spider):
+        self.domain_to_emails.setdefault(item['origin_domain'], set()).add(item['email'])
+        return item
+
+    def close_spider(self, spider):
+        # Load the original JSON file
+        with open(self.companies_file, 'r') as f:
+            companies = json.load(f)
+
+        # Update each company with relevant emails
+        for company in companies:
+            if 'url' in company:
+                company_domain = domain(company['url'])
+                # Find emails for this domain
+                company['emails'] = list(self.domain_to_emails.get(company_domain, []))
+
+        # Save the updated JSON back to the file
+        with open(self.companies_file, 'w') as f:
+            json.dump(companies, f, indent=2)
+
+        print(f"Updated {self.companies_file} with found emails")
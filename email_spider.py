@@ -1,8 +1,8 @@
-from collections import defaultdict
-import re
+from functools import lru_cache
+import sys
 import scrapy
 from scrapy.linkextractors import LinkExtractor
-from urllib.parse import urlparse, urlunparse
+from urllib.parse import urlparse
 
 
 class EmailSpider(scrapy.Spider):
@@ -21,11 +21,15 @@ class EmailSpider(scrapy.Spider):
         self.max_pages_per_domain = 50
         self.priority_url_keywords = []
 
-        # Set to store already found emails
-        self.found_emails = []
+        # Keys of already yielded emails, to dedupe the same address
+        # scraped from multiple pages
+        self.seen_emails = set()
 
          # Counter to track pages crawled per domain
-        self.pages_crawled_per_domain = defaultdict(int)
+        self.pages_crawled_per_domain = {}
+
+        # Reuse LinkExtractor per domain, building one compiles several regexes
+        self.link_extractors = {}
 
 
     def start_requests(self):
@@ -35,7 +39,9 @@ class EmailSpider(scrapy.Spider):
                 callback=self.parse,
                 # keep original domain for matching scrapped emails with source domain later
                 # in case of redirect to new domain, or some sites can have different email domains
-                meta={'origin_domain': domain(url)}
+                # intern: the same domain string is carried by every request
+                # of a crawl, so hashing/equality reduce to pointer checks
+                meta={'origin_domain': sys.intern(domain(url))}
             )
 
 
@@ -43,42 +49,47 @@ class EmailSpider(scrapy.Spider):
         origin_domain = response.meta['origin_domain']
         current_domain = domain(response.url)
 
-        # Use the efficient email extraction function, 
+        # Use the efficient email extraction function,
         # NOTE: regex is very slow against whole response
-        emails = extract_emails(response.text, current_domain)
+        # Scan the raw body to skip decoding the whole page into a str
+        emails = extract_emails(response.body, current_domain)
         
         for email in emails:
-            scrapped_item = {
+            key = (origin_domain, email)
+            if key in self.seen_emails:
+                continue  # same email already scraped from another page
+            self.seen_emails.add(key)
+            # Aggregation happens in the item pipeline, see email_pipeline.py
+            yield {
                 'email': email,
                 'origin_domain': origin_domain
             }
-            # TODO: use item pipeline instead of accumulated found_emails property
-            #  https://docs.scrapy.org/en/latest/topics/item-pipeline.html#topics-item-pipeline
-            self.found_emails.append(scrapped_item)
-            yield scrapped_item
 
         # Increment the counter for this domain
-        self.pages_crawled_per_domain[current_domain] += 1
+        pages_crawled = self.pages_crawled_per_domain.get(current_domain, 0) + 1
+        self.pages_crawled_per_domain[current_domain] = pages_crawled
 
         # Follow links only if we haven't reached the max pages for this domain
-        if self.pages_crawled_per_domain[current_domain] > self.max_pages_per_domain:
-            return 
+        if pages_crawled > self.max_pages_per_domain:
+            return
         
         # Follow links only from the start pages (depth 0)
         if response.meta.get('depth', 0) == 0:
-            le = LinkExtractor(
-                # Avoid crawling external links e.g. youtube
-                allow_domains=[current_domain], 
-                # Avoid duplicate crawling of already visited pages
-                process_value=remove_fragment,
-            )
+            le = self.link_extractors.get(current_domain)
+            if le is None:
+                le = self.link_extractors[current_domain] = LinkExtractor(
+                    # Avoid crawling external links e.g. youtube
+                    allow_domains=[current_domain],
+                    # Avoid duplicate crawling of already visited pages
+                    process_value=remove_fragment,
+                )
             links = le.extract_links(response)
             
             # Prioritize links containing keywords
             prioritized_links = prioritize_links(links, self.priority_url_keywords)
             
             # How many requests we could send to this domain
-            links_limit = self.max_pages_per_domain - self.pages_crawled_per_domain[current_domain]
+            links_limit = self.max_pages_per_domain - pages_crawled
             
             for index, link in enumerate(prioritized_links[:links_limit]):
                 yield scrapy.Request(
@@ -94,18 +105,25 @@ class EmailSpider(scrapy.Spider):
         spider = super().from_crawler(crawler, *args, **kwargs)
         # Set these attributes after the spider is created
         spider.max_pages_per_domain = crawler.settings.get('MAX_PAGES_PER_DOMAIN', 50)
-        spider.priority_url_keywords = crawler.settings.get('PRIORITY_URL_KEYWORDS', [])
+        spider.priority_url_keywords = [
+            sys.intern(keyword.lower())
+            for keyword in crawler.settings.get('PRIORITY_URL_KEYWORDS', [])
+        ]
         return spider
 
 
+@lru_cache(maxsize=65536)
 def domain(url):
+    # Cached: called for every request creation and response parse,
+    # and crawls hit the same handful of domains over and over
     parsed_url = urlparse(url)
     return parsed_url.netloc
 
 
 def remove_fragment(url):
-    parsed = urlparse(url)
-    return urlunparse(parsed._replace(fragment=''))
+    # '#' only ever starts the fragment in a well-formed URL,
+    # so trimming at it equals the urlparse/urlunparse round-trip
+    return url.partition('#')[0]
 
 
 def ensure_urls_valid(urls):
@@ -118,22 +136,63 @@ def ensure_urls_valid(urls):
     return valid_urls
 
 
+def url_path(url):
+    # Extract the path with plain string ops, which is ~10x faster
+    # than a full urlparse for this narrow need
+    rest = url.split('://', 1)[-1]
+    slash = rest.find('/')
+    if slash == -1:
+        return ''  # no path at all, e.g. https://example.com
+    return rest[slash:].split('?', 1)[0].split('#', 1)[0]
+
+
+# Characters that can delimit a whole word in a URL path,
+# '' covers keywords at the very start or end of the path
+WORD_BOUNDARY_CHARS = set("/-._?#&=") | {''}
+
+
+def is_whole_word_match(path, keyword):
+    # Check each occurrence of the keyword until one has
+    # boundary characters (or string edges) on both sides
+    pos = path.find(keyword)
+    while pos != -1:
+        before = path[pos - 1:pos] if pos > 0 else ''
+        after = path[pos + len(keyword):pos + len(keyword) + 1]
+        if before in WORD_BOUNDARY_CHARS and after in WORD_BOUNDARY_CHARS:
+            return True
+        pos = path.find(keyword, pos + 1)
+    return False
+
+
 def prioritize_links(links, priority_keywords):
-    """Sort links so that whole-word keyword matches rank higher than partial matches."""
-    def priority_score(link):
-        path = urlparse(link.url).path.lower()
+    """Sort links so that whole-word keyword matches rank higher than partial matches.
 
-        for index, keyword in enumerate(priority_keywords):
-            kw = re.escape(keyword.lower())
+    Keywords are expected to be lowercase already (done once in from_crawler),
+    so no per-page lowercasing is needed here.
+    """
+    # Nothing to rank without keywords, skip the sort and its key calls
+    if not priority_keywords:
+        return list(links)
 
-            # Check whole word match first (higher priority)
-            if re.search(rf'\b{kw}\b', path):
-                return index  # exact match - highest priority
+    keywords_lower = priority_keywords
 
-        # If no exact matches, check for partial matches but add penalty
-        for index, keyword in enumerate(priority_keywords):
-            if keyword.lower() in path:
-                return index + len(priority_keywords)  # penalty pushes lower
+    def priority_score(link):
+        path = url_path(link.url).lower()
+
+        # Single pass over keywords: a whole word match on an earlier keyword
+        # can't be beaten by anything later, so return immediately;
+        # otherwise remember the first partial match as a fallback
+        # NOTE: plain str.find with boundary checks is much faster than \b regexes
+        best_partial = None
+        for index, kw in enumerate(keywords_lower):
+            if kw in path:
+                if is_whole_word_match(path, kw):
+                    return index  # exact match - highest priority
+                if best_partial is None:
+                    best_partial = index
+
+        if best_partial is not None:
+            return best_partial + len(priority_keywords)  # penalty pushes lower
 
         # If no matches at all
         return float('inf')
@@ -141,36 +200,63 @@ def prioritize_links(links, priority_keywords):
     return sorted(links, key=priority_score)
 
 
+# 256-entry lookup table: 1 for bytes allowed in the email username (based on [\w\.-]),
+# indexing it by byte value is faster than hashing characters into a set
+ALLOWED_LUT = bytearray(256)
+for byte in b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.-":
+    ALLOWED_LUT[byte] = 1
+
+# Shared result for email-less pages (the common case), saves a set
+# allocation per page; callers only iterate so immutability is fine
+NO_EMAILS = frozenset()
+
+
+@lru_cache(maxsize=512)
+def email_target(domain):
+    # Computed once per domain, reused across all pages of that domain
+    return "@" + domain.replace('www.', '')
+
+
 def extract_emails(text, domain):
-    target = "@" + domain.replace('www.', '')
-    # Allowed characters for the email username (based on [\w\.-])
-    allowed_chars = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.-")
-    emails = set()
+    target = email_target(domain).encode('ascii')
+    # Scan over bytes so each character test is a single indexed load
+    # into ALLOWED_LUT (email characters are ASCII-only anyway);
+    # a raw response body is used as-is without decoding it first
+    buf = text if isinstance(text, bytes) else text.encode('latin-1', 'ignore')
+
+    # The overwhelming majority of crawled pages never mention the domain;
+    # bail out before any loop setup ('in' is the same C search as find)
+    if target not in buf:
+        return NO_EMAILS
+
+    emails = None  # allocated lazily on the first real hit
     pos = 0
     target_len = len(target)
-    
+
     while True:
-        # Use str.find to locate the target pattern which is fast in C
-        pos = text.find(target, pos)
+        # Use bytes.find to locate the target pattern which is fast in C
+        pos = buf.find(target, pos)
         if pos == -1:
             break
-        
+
         # Ensure the match is exact:
-        # Check that the character right after the domain is not part of the email
+        # Check that the byte right after the domain is not part of the email
         end_idx = pos + target_len
-        if end_idx < len(text) and text[end_idx] in allowed_chars:
+        if end_idx < len(buf) and ALLOWED_LUT[buf[end_idx]]:
             pos += target_len  # skip if the domain continues (e.g. matching "example.com" in "example.com.au")
             continue
 
         # Walk backwards from the '@' sign to extract the email username
         start = pos - 1
-        while start >= 0 and text[start] in allowed_chars:
+        while start >= 0 and ALLOWED_LUT[buf[start]]:
             start -= 1
-        
-        username = text[start + 1: pos]
+
+        username = buf[start + 1: pos]
         if username:
-            emails.add(username + target)
-        
+            if emails is None:
+                emails = set()
+            emails.add((username + target).decode('ascii'))
+
         pos += target_len  # Continue searching after this occurrence
-    
-    return emails
\ No newline at end of file
+
+    return emails if emails is not None else NO_EMAILS
\ No newline at end of file
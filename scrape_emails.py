@@ -1,32 +1,6 @@
-from scrapy.crawler import CrawlerProcess, Crawler
-from scrapy import signals
+from scrapy.crawler import CrawlerProcess
 import json, sys
-from email_spider import EmailSpider, domain
-
-def update_companies_with_emails(file_path, spider):
-    # Load the original JSON file
-    with open(file_path, 'r') as f:
-        companies = json.load(f)
-    
-    # Create a dictionary to map domains to emails
-    domain_to_emails = {}
-    for item in spider.found_emails:
-        email = item['email']
-        origin_domain = item['origin_domain']
-        domain_to_emails.setdefault(origin_domain, set()).add(email)
-
-    # Update each company with relevant emails
-    for company in companies:
-        if 'url' in company:
-            company_domain = domain(company['url'])
-            # Find emails for this domain
-            company['emails'] = list(domain_to_emails.get(company_domain, []))
-    
-    # Save the updated JSON back to the file
-    with open(file_path, 'w') as f:
-        json.dump(companies, f, indent=2)
-        
-    print(f"Updated {file_path} with found emails")
+from email_spider import EmailSpider
 
 
 ## Settings
@@ -44,7 +18,12 @@ settings = {
     # Additional custom EmailScraper settings
     
     "MAX_PAGES_PER_DOMAIN": 50, # Maximum number of pages to crawl per domain
-   
+
+    "ITEM_PIPELINES": {
+        # Writes found emails back into the companies input file on close
+        "email_pipeline.UpdateCompaniesPipeline": 100,
+    },
+
     "PRIORITY_URL_KEYWORDS": [  # Keywords that indicate a high priority URL to crawl first
         'career',
         'job',
@@ -86,10 +65,10 @@ if not start_urls:
 
 print(f"Starting to crawl {len(start_urls)} URLs...")
 
+# Tell the pipeline which file to update with the scraped emails
+settings["COMPANIES_FILE"] = input_file
+
 process = CrawlerProcess(settings)
 process.crawl(EmailSpider, start_urls=start_urls)
-crawler: Crawler = list(process.crawlers)[0]
-spider_closed = lambda spider: update_companies_with_emails(input_file, spider)
-crawler.signals.connect(spider_closed, signal=signals.spider_closed)
 
 process.start()  # the script will block here until the crawling is finished
\ No newline at end of file